@@ -0,0 +1,61 @@
+"""CPU cost vs bytes saved for compressing /news article lists.
+
+Serializes the /news payload (padded with synthetic articles) and times every
+available encoder across a range of levels, then measures how much the
+pre-compressed cache saves on repeat requests through the middleware.
+
+    python bench_compression.py [--articles 500] [--rounds 20]
+"""
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from bench_event_loop import synthetic_articles
+
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 4, 6, 9, 11], "zstd": [1, 3, 6, 12, 19]}
+
+
+def time_encoder(encoding: str, level: int, payload: bytes, rounds: int):
+    encode = main.ENCODERS[encoding]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        compressed = encode(payload, level)
+    elapsed = (time.perf_counter() - start) / rounds
+    return len(compressed), elapsed
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    app = main.create_app(news_bot=main.NewsBot(store=main.NewsStore(synthetic_articles(args.articles))))
+    client = TestClient(app)
+    payload = client.get("/news", headers={"Accept-Encoding": "identity"}).content
+    print(f"identity payload: {len(payload)} bytes; encoders available: {', '.join(main.ENCODERS)}")
+    print(f"{'encoding':<8} {'level':>5} {'bytes':>10} {'ratio':>7} {'ms/resp':>9} {'MB/s':>8}")
+
+    for encoding in main.ENCODERS:
+        for level in LEVELS[encoding]:
+            size, elapsed = time_encoder(encoding, level, payload, args.rounds)
+            print(f"{encoding:<8} {level:>5} {size:>10} {len(payload) / size:>7.2f}"
+                  f" {elapsed * 1000:>9.3f} {len(payload) / elapsed / 1e6:>8.1f}")
+
+    print("\nthrough middleware (configured /news levels), first request vs cached repeats:")
+    for encoding in main.ENCODERS:
+        headers = {"Accept-Encoding": encoding}
+        start = time.perf_counter()
+        client.get("/news", headers=headers)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            client.get("/news", headers=headers)
+        repeat = (time.perf_counter() - start) / args.rounds
+        print(f"{encoding:<8} first {first * 1000:8.2f} ms   repeat {repeat * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main_cli()
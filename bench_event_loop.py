@@ -0,0 +1,118 @@
+"""Event-loop latency benchmark for the NewsBot API under mixed load.
+
+Runs the app in-process and fires a mix of /chat, /news/{category} and
+/news/article/{id} requests against a store padded with synthetic articles, while
+a probe task measures how late the event loop wakes it up. Compares ranking
+inline on the loop with ranking offloaded to the bounded pool. The store is
+built without latest views, which would otherwise answer /chat without ranking.
+
+    python bench_event_loop.py [--articles 20000] [--requests 400] [--concurrency 32]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+import main
+
+CATEGORIES = ["tech", "politics", "finance"]
+MESSAGES = ["hello", "latest news", "show me tech", "market updates", "help", "anything else"]
+
+
+def synthetic_articles(count: int) -> list:
+    articles = list(main.MOCK_NEWS_DATA)
+    next_id = max(article["id"] for article in articles) + 1
+    for offset in range(count):
+        articles.append({
+            "id": next_id + offset,
+            "title": f"Synthetic article {offset}",
+            "content": "Lorem ipsum " * 20,
+            "category": CATEGORIES[offset % len(CATEGORIES)],
+            "author": "Bench",
+            "published_date": f"2023-{offset % 12 + 1:02d}-{offset % 28 + 1:02d}T{offset % 24:02d}:00:00Z",
+            "url": f"https://example.com/{offset}",
+            "summary": "Synthetic summary.",
+        })
+    return articles
+
+
+async def probe_lag(stop: asyncio.Event, samples: list, interval: float = 0.001):
+    """Record how far past `interval` each sleep actually woke up"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(loop.time() - start - interval)
+
+
+async def one_request(client: httpx.AsyncClient, rng: random.Random, latencies: list):
+    kind = rng.random()
+    start = time.perf_counter()
+    if kind < 0.8:
+        await client.post("/chat", json={"message": rng.choice(MESSAGES), "user_preferences": CATEGORIES})
+    elif kind < 0.85:
+        await client.get(f"/news/{rng.choice(CATEGORIES)}")
+    else:
+        await client.get(f"/news/article/{rng.randint(1, 30)}")
+    latencies.append(time.perf_counter() - start)
+
+
+async def run_load(app, total: int, concurrency: int) -> dict:
+    rng = random.Random(0)
+    lag, latencies = [], []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(stop, lag))
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def bounded():
+            async with semaphore:
+                await one_request(client, rng, latencies)
+
+        await asyncio.gather(*(bounded() for _ in range(total)))
+
+    stop.set()
+    await probe
+    return {"lag": lag, "latency": latencies}
+
+
+def pct(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+
+def report(label: str, result: dict):
+    lag, latency = result["lag"], result["latency"]
+    print(f"{label:<10} loop lag ms  p50={pct(lag, .5):7.2f} p99={pct(lag, .99):7.2f} max={max(lag) * 1000:7.2f}"
+          f" | request ms p50={pct(latency, .5):7.2f} p99={pct(latency, .99):7.2f}"
+          f" mean={statistics.mean(latency) * 1000:7.2f}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    # No materialized views, so /chat ranks the full candidate set and the threshold decides where
+    store = main.NewsStore(synthetic_articles(args.articles), view_size=0)
+    # Measure the loop itself, not the protections in front of it
+    app = main.create_app(
+        news_bot=main.NewsBot(store=store),
+        rate_limiter=main.TokenBucketLimiter(rate=1e12, burst=1e12, slots=1),
+        admission=main.AdmissionController(max_in_flight=args.requests + 1, max_lag=float("inf")),
+    )
+    print(f"{len(store._articles)} articles, {args.requests} requests, concurrency {args.concurrency}")
+
+    for label, threshold in (("inline", float("inf")), ("offload", 0)):
+        main.OFFLOAD_THRESHOLD = threshold
+        report(label, asyncio.run(run_load(app, args.requests, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main_cli()
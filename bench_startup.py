@@ -0,0 +1,83 @@
+"""Cold-start benchmark: import time and time-to-ready, with regression budgets.
+
+Each run happens in a fresh interpreter. Exits non-zero when the median import
+or ready time exceeds its budget, so it can gate CI.
+
+    python bench_startup.py [--runs 5] [--import-budget 0.6] [--ready-budget 1.0] [--audit]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def wait_ready():
+    loader = main.app.state.loader
+    loader.start()
+    await loader.get(60)
+
+asyncio.run(wait_ready())
+ready = time.perf_counter()
+print(json.dumps({"import": imported - started, "ready": ready - started}))
+"""
+
+
+def run_probe() -> dict:
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=HERE, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def import_audit(top: int):
+    """Print the modules with the largest self import time when importing main"""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=HERE,
+                         check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    print("\nslowest imports (self time):")
+    for self_us, cumulative_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.2f} ms self {cumulative_us / 1000:8.2f} ms cumulative  {name}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=float(os.environ.get("NEWSBOT_IMPORT_BUDGET", "0.6")))
+    parser.add_argument("--ready-budget", type=float, default=float(os.environ.get("NEWSBOT_READY_BUDGET", "1.0")))
+    parser.add_argument("--audit", action="store_true", help="also print the slowest imports")
+    args = parser.parse_args()
+
+    samples = [run_probe() for _ in range(args.runs)]
+    import_s = statistics.median(sample["import"] for sample in samples)
+    ready_s = statistics.median(sample["ready"] for sample in samples)
+    print(f"import  median {import_s * 1000:8.1f} ms (budget {args.import_budget * 1000:.0f} ms)")
+    print(f"ready   median {ready_s * 1000:8.1f} ms (budget {args.ready_budget * 1000:.0f} ms)")
+    if args.audit:
+        import_audit(15)
+
+    failed = []
+    if import_s > args.import_budget:
+        failed.append("import")
+    if ready_s > args.ready_budget:
+        failed.append("ready")
+    if failed:
+        print(f"\nFAIL: {' and '.join(failed)} time over budget")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,29 +1,60 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import List, Optional
-import uvicorn
+from starlette.datastructures import Headers, MutableHeaders
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import Callable, Dict, FrozenSet, Iterable, List, Literal, Optional, Sequence, Set, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import asyncio
+import functools
+import heapq
+import itertools
+import math
+import zlib
+import gzip
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from array import array
+from collections import Counter, OrderedDict, defaultdict, deque
 import json
-from datetime import datetime, timedelta
+import logging
+import re
+from datetime import datetime, timedelta, timezone
 import random
 import os
+import sqlite3
+import queue
+import threading
+import time
 
-app = FastAPI(title="AI News Chatbot", description="Personalized news chatbot with tech, politics, and finance updates")
+try:
+    import brotli
+except ImportError:  # optional: br is only offered when installed
+    brotli = None
 
-# Mount static files for assets
-app.mount("/static", StaticFiles(directory="."), name="static")
+try:
+    import zstandard
+except ImportError:  # optional: zstd is only offered when installed
+    zstandard = None
+
+logger = logging.getLogger("newsbot")
 
 # Pydantic models
+DEFAULT_PREFERENCES = ["tech", "politics", "finance"]
+
 class ChatMessage(BaseModel):
     message: str
-    user_preferences: Optional[List[str]] = ["tech", "politics", "finance"]
+    user_preferences: Optional[List[str]] = DEFAULT_PREFERENCES
+    session_id: Optional[str] = None
+    fields: Optional[List[str]] = None
 
 class ChatResponse(BaseModel):
     response: str
     news_articles: Optional[List[dict]] = None
 
 class NewsArticle(BaseModel):
+    # `categories` is only set on multi-label articles; routes drop it when unset
     id: int
     title: str
     content: str
@@ -32,6 +63,30 @@ class NewsArticle(BaseModel):
     published_date: str
     url: str
     summary: str
+    categories: Optional[List[str]] = None
+
+class BulkNewsArticle(NewsArticle):
+    # Uncategorized feeds are classified at ingest
+    category: Optional[str] = None
+
+class BulkRecordError(BaseModel):
+    line: int
+    error: str
+
+class BulkIngestResult(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[BulkRecordError] = []
+
+class EngagementEvent(BaseModel):
+    type: Literal["view", "click"] = "view"
+
+class NewsUpdates(BaseModel):
+    cursor: int
+    articles: List[NewsArticle]
+    reset: bool = False
 
 # Mock news data (30 articles)
 MOCK_NEWS_DATA = [
@@ -342,10 +397,1038 @@ MOCK_NEWS_DATA = [
     }
 ]
 
+# Topic and entity extraction
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers him his how i if in into is it its itself just latest me more most my new news no nor not now of
+off on once only or other our out over own same she should show so some such tell than that the their them
+then there these they this those through to too under until up update updates very was we were what when
+where which while who whom why will with would you your
+""".split())
+
+TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9'\-]*")
+SENTENCE_BREAKS = frozenset(".!?;:")
+# Words, plus sentence-ending punctuation runs so extraction can break phrases on them
+KEYPHRASE_TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9'\-]*|[.!?;:]+(?=\s|$)")
+TOPIC_QUERY_RE = re.compile(r"\b(?:tell me about|show me)\s+(.+)")
+
+@functools.lru_cache(maxsize=65536)
+def normalize_token(token: str) -> str:
+    """Lowercase a token and strip possessives and simple plurals"""
+    token = token.lower().strip("'-")
+    if token.endswith("'s"):
+        token = token[:-2]
+    if len(token) > 4 and token.endswith("ies"):
+        token = token[:-3] + "y"
+    elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return token
+
+@functools.lru_cache(maxsize=65536)
+def _content_token(word: str) -> Optional[str]:
+    """Normalized token, or None for stopwords and sentence breaks"""
+    token = normalize_token(word)
+    if token in STOPWORDS or token[:1] in SENTENCE_BREAKS:
+        return None
+    return token
+
+@functools.lru_cache(maxsize=65536)
+def _entity_token(word: str) -> Optional[str]:
+    """Normalized token for a capitalized content word, else None"""
+    return _content_token(word) if word[0].isupper() else None
+
+def extract_keyphrases(text: str, max_entity_len: int = 4) -> Set[str]:
+    """Extract entity spans (runs of capitalized words) plus content unigrams and bigrams
+
+    Sentence punctuation is tokenized alongside words and acts as a break, like a
+    stopword, so phrases never span sentences and the text is scanned only once.
+    """
+    words = KEYPHRASE_TOKEN_RE.findall(text)
+    content = list(map(_content_token, words))
+    phrases: Set[str] = set(content)
+    phrases.discard(None)
+    phrases.update([f"{first} {second}" for first, second in zip(content, content[1:]) if first and second])
+    for is_entity, run in itertools.groupby(map(_entity_token, words), key=bool):
+        if not is_entity:
+            continue
+        run = list(run)
+        if len(run) == 1:
+            continue
+        for start in range(0, len(run), max_entity_len):
+            span = run[start:start + max_entity_len]
+            if len(span) > 1:
+                phrases.add(" ".join(span))
+    return phrases
+
+def normalize_phrase(text: str) -> str:
+    """Normalize a query phrase the same way article keyphrases are normalized"""
+    tokens = (normalize_token(word) for word in TOKEN_RE.findall(text))
+    return " ".join(token for token in tokens if token not in STOPWORDS)
+
+def extract_topic_query(message: str) -> Optional[str]:
+    """Pull X out of "tell me about X" / "show me X", normalized for index lookup"""
+    match = TOPIC_QUERY_RE.search(message)
+    if not match:
+        return None
+    return normalize_phrase(match.group(1)) or None
+
+class EntityIndex:
+    """Posting index from normalized keyphrase to article ids, built once per article at ingest"""
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._keys: Dict[int, Set[str]] = {}
+
+    @staticmethod
+    def extract(article: dict) -> Set[str]:
+        return extract_keyphrases(". ".join((article["title"], article["summary"], article["content"])))
+
+    def add(self, article: dict, keys: Optional[Set[str]] = None):
+        article_id = article["id"]
+        if keys is None:
+            keys = self.extract(article)
+        self._keys[article_id] = keys
+        postings = self._postings
+        for key in keys:
+            postings[key].add(article_id)
+
+    def remove(self, article_id: int):
+        for key in self._keys.pop(article_id, ()):
+            postings = self._postings.get(key)
+            if postings is not None:
+                postings.discard(article_id)
+                if not postings:
+                    del self._postings[key]
+
+    def lookup(self, phrase: str) -> Set[int]:
+        return self._postings.get(phrase, set())
+
+    def compact(self):
+        """Re-allocate the tables so memory freed by removals is returned"""
+        self._postings = defaultdict(set, self._postings)
+        self._keys = dict(self._keys)
+
+# Category classification
+DEFAULT_CATEGORY_LEXICON = {
+    "tech": {
+        "ai": 3, "artificial": 1, "intelligence": 1, "model": 1, "quantum": 3, "qubit": 3, "processor": 2,
+        "chip": 2, "semiconductor": 3, "software": 2, "hardware": 2, "computing": 2, "cybersecurity": 3,
+        "5g": 3, "network": 1, "cloud": 2, "robot": 2, "startup": 1, "app": 1, "smartphone": 2, "data": 1,
+        "algorithm": 2, "electric": 1, "vehicle": 1, "battery": 1, "technology": 2, "tech": 2, "digital": 1,
+        "virtual": 2, "reality": 1, "vr": 3, "gaming": 2,
+    },
+    "politics": {
+        "election": 3, "vote": 2, "voting": 2, "voter": 2, "senate": 3, "congress": 3, "parliament": 3,
+        "president": 2, "minister": 2, "government": 2, "policy": 1, "legislation": 3, "bill": 1,
+        "lawmaker": 3, "campaign": 2, "diplomatic": 2, "treaty": 2, "summit": 1, "administration": 1,
+        "immigration": 2, "reform": 1, "court": 1, "political": 3, "politics": 3, "democracy": 2,
+        "bipartisan": 3, "party": 1, "agreement": 2, "trade": 1, "alliance": 3, "allied": 2, "nation": 1,
+        "security": 1, "infrastructure": 1,
+    },
+    "finance": {
+        "market": 2, "stock": 3, "investor": 2, "investment": 2, "investing": 2, "bank": 2, "rate": 1,
+        "inflation": 3, "federal": 1, "reserve": 1, "earnings": 3, "revenue": 2, "profit": 2, "bond": 2,
+        "currency": 3, "crypto": 3, "cryptocurrency": 3, "bitcoin": 3, "economy": 2, "economic": 2,
+        "gdp": 3, "trading": 2, "fund": 2, "financial": 3, "finance": 3, "dollar": 2, "esg": 2,
+    },
+}
+
+def load_category_lexicon() -> Dict[str, Dict[str, float]]:
+    """Load the category lexicon from NEWSBOT_CATEGORY_LEXICON (a JSON file) or use the default"""
+    path = os.environ.get("NEWSBOT_CATEGORY_LEXICON")
+    if not path:
+        return DEFAULT_CATEGORY_LEXICON
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+class CategoryClassifier:
+    """Weighted keyword lexicon scored as a sparse term-by-category matrix product
+
+    The lexicon is compiled into postings of term -> [(category index, weight)], so scoring
+    an article touches only the terms it actually contains. Title terms count double.
+    """
+    def __init__(self, lexicon: Dict[str, Dict[str, float]], fallback: str = "general",
+                 min_score: float = 2.0, relative_threshold: float = 0.6):
+        self.fallback = fallback
+        self.min_score = min_score
+        self.relative_threshold = relative_threshold
+        self._labels = list(lexicon)
+        self._weights: Dict[str, List[Tuple[int, float]]] = {}
+        for index, label in enumerate(self._labels):
+            for term, weight in lexicon[label].items():
+                self._weights.setdefault(normalize_token(term), []).append((index, weight))
+
+    @property
+    def categories(self) -> List[str]:
+        """All categories an article can be assigned, including the fallback"""
+        return self._labels + ([self.fallback] if self.fallback not in self._labels else [])
+
+    def _score(self, terms: Counter) -> List[float]:
+        scores = [0.0] * len(self._labels)
+        weights = self._weights
+        for term, count in terms.items():
+            for index, weight in weights.get(term, ()):
+                scores[index] += weight * count
+        return scores
+
+    def _labels_for(self, scores: List[float]) -> List[str]:
+        top = max(scores, default=0.0)
+        if top < self.min_score:
+            return [self.fallback]
+        ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        return [self._labels[i] for i in ranked if scores[i] >= top * self.relative_threshold]
+
+    def classify_batch(self, articles: List[dict]) -> List[List[str]]:
+        """Assign one or more categories to each article, best match first"""
+        results = []
+        for article in articles:
+            terms = Counter(normalize_token(w) for w in TOKEN_RE.findall(article.get("title", "")))
+            terms += terms
+            terms.update(normalize_token(w) for w in TOKEN_RE.findall(
+                f"{article.get('summary', '')} {article.get('content', '')}"))
+            results.append(self._labels_for(self._score(terms)))
+        return results
+
+    def classify(self, article: dict) -> List[str]:
+        return self.classify_batch([article])[0]
+
+TEXT_FIELDS = ("title", "summary", "content")
+
+def same_text(article: dict, other: dict) -> bool:
+    """Whether two versions of an article share the text keyphrases are extracted from"""
+    return all(article[field] == other[field] for field in TEXT_FIELDS)
+
+def article_categories(article: dict) -> List[str]:
+    """All categories an article belongs to, primary category first"""
+    return article.get("categories") or [article["category"]]
+
+# Change notifications
+class ArticleFeed:
+    """Per-category change logs plus shared wake-up events for long-poll and SSE subscribers
+
+    Waiters park on one asyncio.Event per category, so an idle subscriber costs a single
+    suspended coroutine and publishing wakes only subscribers of the touched categories.
+    """
+    def __init__(self, log_size: int = 1024):
+        self.log_size = log_size
+        self._logs: Dict[str, deque] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+
+    def publish(self, categories: Iterable[str], version: int, article_id: int):
+        for category in categories:
+            log = self._logs.get(category)
+            if log is None:
+                log = self._logs[category] = deque(maxlen=self.log_size)
+            log.append((version, article_id))
+            event = self._events.pop(category, None)
+            if event is not None:
+                event.set()
+
+    def changes_since(self, category: str, since: int) -> Tuple[List[int], bool]:
+        """Article ids changed after version `since`, oldest first, and whether the log overflowed"""
+        log = self._logs.get(category, ())
+        changed = []
+        for version, article_id in reversed(log):
+            if version <= since:
+                break
+            changed.append(article_id)
+        overflowed = bool(log) and len(log) == self.log_size and log[0][0] > since + 1
+        return list(dict.fromkeys(reversed(changed))), overflowed
+
+    async def wait(self, category: str, timeout: float) -> bool:
+        """Wait until something in `category` is published; False on timeout"""
+        event = self._events.get(category)
+        if event is None:
+            event = self._events[category] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+# Retention and tiered storage
+# Articles published more than this many days ago leave memory for the cold tier; 0 keeps everything hot
+RETENTION_DAYS = float(os.environ.get("NEWSBOT_RETENTION_DAYS", "0"))
+COLD_STORE_PATH = os.environ.get("NEWSBOT_COLD_PATH", "newsbot_cold.sqlite3")
+COMPACTION_INTERVAL = float(os.environ.get("NEWSBOT_COMPACTION_INTERVAL", "60"))
+# Articles moved per step of a compaction pass; the event loop is released between steps
+COMPACTION_BATCH_SIZE = 500
+
+def retention_cutoff(days: float, now: Optional[float] = None) -> str:
+    """The published_date below which an article belongs in the cold tier"""
+    moment = datetime.fromtimestamp(time.time() if now is None else now, timezone.utc) - timedelta(days=days)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class ColdArticleStore:
+    """Compressed on-disk tier for articles that have aged out of memory
+
+    Each article is a zlib-compressed JSON blob in SQLite keyed by id, so lookups go through
+    the on-disk primary key and nothing per article stays resident. Calls block; run them
+    off the event loop.
+    """
+    def __init__(self, path: str = COLD_STORE_PATH, level: int = 6):
+        self.path = path
+        self.level = level
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # WAL with NORMAL sync survives a process crash without an fsync per compaction batch
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS articles (id INTEGER PRIMARY KEY, body BLOB NOT NULL)")
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def _existing(self, article_ids: List[int]) -> Set[int]:
+        found = set()
+        for start in range(0, len(article_ids), 500):
+            chunk = article_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(row[0] for row in self._db.execute(
+                f"SELECT id FROM articles WHERE id IN ({placeholders})", chunk))
+        return found
+
+    def put_many(self, articles: List[dict]) -> Set[int]:
+        """Write articles, replacing earlier copies; returns the ids that were already stored"""
+        rows = [
+            (article["id"], zlib.compress(json.dumps(article, separators=(",", ":")).encode(), self.level))
+            for article in articles
+        ]
+        with self._lock, self._db:
+            replaced = self._existing([row[0] for row in rows])
+            self._db.executemany("INSERT OR REPLACE INTO articles (id, body) VALUES (?, ?)", rows)
+        return replaced
+
+    def discard_many(self, article_ids: List[int]) -> Set[int]:
+        """Delete articles that have moved back into memory; returns the ids that were stored"""
+        with self._lock, self._db:
+            removed = self._existing(article_ids)
+            self._db.executemany("DELETE FROM articles WHERE id = ?", ((article_id,) for article_id in removed))
+        return removed
+
+    def get(self, article_id: int) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute("SELECT body FROM articles WHERE id = ?", (article_id,)).fetchone()
+        return None if row is None else json.loads(zlib.decompress(row[0]))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+# Article store
+class LatestViews:
+    """Materialized top-N "latest" views over single categories and a few category sets
+
+    Every configured category gets its own view, plus the `eager` sets (the default
+    preferences). Other combinations are materialized on first read and kept in an LRU of
+    at most `max_lazy` views, so the view count grows linearly with the categories instead
+    of with every subset. Each view is a bounded min-heap keyed on
+    (published_date, -insertion_seq), so an insert costs O(log N) per view containing one of
+    its categories and the ordering matches a stable newest-first sort. Sorted snapshots are
+    cached until the next insert. Labels outside the configured set are not materialized.
+    """
+    def __init__(self, size: int = 10, categories: Iterable[str] = (),
+                 eager: Iterable[Iterable[str]] = (), max_lazy: int = 64):
+        self.size = size
+        self.max_lazy = max_lazy
+        self._heaps: Dict[FrozenSet[str], List[Tuple[str, int, dict]]] = {}
+        self._snapshots: Dict[FrozenSet[str], List[dict]] = {}
+        self._containing: Dict[str, List[FrozenSet[str]]] = {category: [] for category in categories}
+        self._lazy: "OrderedDict[FrozenSet[str], None]" = OrderedDict()
+        for category in self._containing:
+            self._add_view(frozenset([category]))
+        for categories in eager:
+            subset = frozenset(category for category in categories if category in self._containing)
+            if subset and subset not in self._heaps:
+                self._add_view(subset)
+
+    def _add_view(self, subset: FrozenSet[str]):
+        self._heaps[subset] = []
+        for category in subset:
+            self._containing[category].append(subset)
+
+    def _drop_view(self, subset: FrozenSet[str]):
+        del self._heaps[subset]
+        self._snapshots.pop(subset, None)
+        for category in subset:
+            self._containing[category].remove(subset)
+
+    def add_lazy(self, categories: Iterable[str]) -> bool:
+        """Create an empty view for a category set on demand; the caller must refill it
+
+        Returns False when the set is already materialized or cannot be (unknown categories
+        or no lazy capacity). Evicts the least recently read lazy view when full.
+        """
+        subset = frozenset(categories)
+        if (not subset or subset in self._heaps or not self.max_lazy
+                or any(category not in self._containing for category in subset)):
+            return False
+        self._add_view(subset)
+        self._lazy[subset] = None
+        if len(self._lazy) > self.max_lazy:
+            self._drop_view(self._lazy.popitem(last=False)[0])
+        return True
+
+    def insert(self, article: dict, seq: int):
+        entry = (article["published_date"], -seq, article)
+        subsets = {
+            subset for category in article_categories(article)
+            for subset in self._containing.get(category, ())
+        }
+        for subset in subsets:
+            heap = self._heaps[subset]
+            if len(heap) < self.size:
+                heapq.heappush(heap, entry)
+            elif heap and entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+            else:
+                continue
+            self._snapshots.pop(subset, None)
+
+    def latest(self, categories: Iterable[str], limit: int) -> Optional[List[dict]]:
+        """Read the newest `limit` articles, or None when the view cannot answer"""
+        subset = frozenset(categories)
+        if limit > self.size or not subset or subset not in self._heaps:
+            return None
+        if subset in self._lazy:
+            self._lazy.move_to_end(subset)
+        snapshot = self._snapshots.get(subset)
+        if snapshot is None:
+            snapshot = [entry[2] for entry in sorted(self._heaps[subset], key=lambda e: e[:2], reverse=True)]
+            self._snapshots[subset] = snapshot
+        return snapshot[:limit]
+
+    def remove(self, article_id: int, categories: Iterable[str]) -> List[FrozenSet[str]]:
+        """Drop an article from the views of its categories, returning those that held it (they need a refill)"""
+        return self.remove_many({article_id}, categories)
+
+    def remove_many(self, article_ids: Set[int],
+                    categories: Optional[Iterable[str]] = None) -> List[FrozenSet[str]]:
+        """Drop a batch of articles in one pass over the views, returning the views that changed
+
+        Pass the articles' `categories` to visit only the views that can hold them.
+        """
+        if categories is None:
+            subsets = list(self._heaps)
+        else:
+            subsets = {subset for category in categories for subset in self._containing.get(category, ())}
+        affected = []
+        for subset in subsets:
+            heap = self._heaps[subset]
+            kept = [entry for entry in heap if entry[2]["id"] not in article_ids]
+            if len(kept) != len(heap):
+                heapq.heapify(kept)
+                self._heaps[subset] = kept
+                self._snapshots.pop(subset, None)
+                affected.append(subset)
+        return affected
+
+    def refill(self, subset: FrozenSet[str], entries: Iterable[Tuple[str, int, dict]]):
+        """Rebuild one view from all of its candidate (published_date, -seq, article) entries"""
+        if subset not in self._heaps:
+            return  # a lazy view evicted since it went stale
+        heap = heapq.nlargest(self.size, entries, key=lambda e: e[:2])
+        heapq.heapify(heap)
+        self._heaps[subset] = heap
+        self._snapshots.pop(subset, None)
+
+# Category sets beyond the single categories and the default preferences keep at most this many views
+MAX_LAZY_VIEWS = int(os.environ.get("NEWSBOT_MAX_LAZY_VIEWS", "64"))
+
+class NewsStore:
+    """In-memory article store with async accessors
+
+    With a retention window, only articles published within the last `retention_days` stay
+    in memory; `compact` moves older ones to the cold tier, where `get` still finds them.
+    """
+    def __init__(self, articles: List[dict], view_size: int = 10,
+                 classifier: Optional[CategoryClassifier] = None,
+                 retention_days: Optional[float] = None, cold: Optional[ColdArticleStore] = None):
+        self.classifier = classifier or CategoryClassifier(load_category_lexicon())
+        self.retention_days = RETENTION_DAYS if retention_days is None else retention_days
+        self.cold = cold if cold is not None or not self.retention_days else ColdArticleStore()
+        self._evicted_since_rebuild = 0
+        self._articles: Dict[int, dict] = {}
+        self._by_category: Dict[str, Dict[int, dict]] = {}
+        self._seq = itertools.count()
+        self._seqs: Dict[int, int] = {}
+        self.views = LatestViews(view_size, self.classifier.categories, eager=[DEFAULT_PREFERENCES],
+                                 max_lazy=MAX_LAZY_VIEWS)
+        self.entities = EntityIndex()
+        self.version = 0
+        self.modified_at = time.time()
+        self._category_versions: Dict[str, Tuple[int, float]] = {}
+        self.feed = ArticleFeed()
+        self.insert_many(articles)
+
+    def classify_missing(self, articles: List[dict]):
+        """Fill in `category`/`categories` for articles ingested without one, in a single batch"""
+        pending = [article for article in articles if not article.get("category")]
+        for article, labels in zip(pending, self.classifier.classify_batch(pending)):
+            article["category"] = labels[0]
+            article["categories"] = labels
+
+    def prepare(self, articles: List[dict]) -> List[Optional[Set[str]]]:
+        """CPU-heavy half of ingestion: classify uncategorized articles and extract their keyphrases
+
+        Only reads the indexes, so it can run in a worker thread while the event loop keeps
+        serving reads. Updates whose text matches the stored article get None: their postings
+        are kept as they are.
+        """
+        self.classify_missing(articles)
+        keyphrases = []
+        for article in articles:
+            previous = self._articles.get(article["id"])
+            unchanged = previous is not None and same_text(previous, article)
+            keyphrases.append(None if unchanged else self.entities.extract(article))
+        return keyphrases
+
+    def insert_many(self, articles: List[dict],
+                    keyphrases: Optional[List[Optional[Set[str]]]] = None) -> Tuple[int, int]:
+        """Upsert a batch: classify uncategorized articles together, update every index once
+
+        Pass the result of `prepare` as `keyphrases` to skip the CPU-heavy half.
+        Returns (inserted, updated). Views that lost a replaced article are refilled once per batch.
+        """
+        if keyphrases is None:
+            keyphrases = self.prepare(articles)
+        inserted = updated = 0
+        stale_views: Set[FrozenSet[str]] = set()
+        for article, keys in zip(articles, keyphrases):
+            if self._apply(article, keys, stale_views):
+                updated += 1
+            else:
+                inserted += 1
+        for subset in stale_views:
+            self._refill_view(subset)
+        return inserted, updated
+
+    def insert(self, article: dict):
+        """Insert or replace an article and update the latest views"""
+        self.insert_many([article])
+
+    async def upsert(self, articles: List[dict]) -> Tuple[int, int]:
+        """Ingest a batch, preparing it in a worker thread; past-retention articles go straight to the cold tier"""
+        keyphrases = await asyncio.to_thread(self.prepare, articles)
+        if self.cold is None:
+            return self.insert_many(articles, keyphrases)
+        cutoff = retention_cutoff(self.retention_days)
+        hot = [(article, keys) for article, keys in zip(articles, keyphrases) if article["published_date"] >= cutoff]
+        expired = [article for article in articles if article["published_date"] < cutoff]
+        promoted = [article["id"] for article, _ in hot if article["id"] not in self._articles]
+        # Every article stays readable from one tier: promotions land in memory before their cold
+        # copies are deleted, and demotions are written to disk before they leave memory
+        inserted, updated = self.insert_many([article for article, _ in hot], [keys for _, keys in hot])
+        replaced, unshadowed = await asyncio.to_thread(self._write_cold, expired, promoted)
+        demoted = [self._articles[article["id"]] for article in expired if article["id"] in self._articles]
+        self._evict(demoted)
+        # An article moving between tiers is an update of one the store already had
+        moved = len(unshadowed)
+        expired_updates = len(replaced | {article["id"] for article in demoted})
+        return inserted - moved + len(expired) - expired_updates, updated + moved + expired_updates
+
+    def _write_cold(self, expired: List[dict], promoted: List[int]) -> Tuple[Set[int], Set[int]]:
+        replaced = self.cold.put_many(expired) if expired else set()
+        unshadowed = self.cold.discard_many(promoted) if promoted else set()
+        return replaced, unshadowed
+
+    async def compact(self, now: Optional[float] = None) -> int:
+        """Move articles past the retention window to the cold tier and shrink the hot indexes
+
+        Works in batches so requests keep being served: each batch is written to disk in a
+        worker thread before it is removed from memory, so `get` always finds an article in
+        one of the tiers. Returns the number of articles moved.
+        """
+        if self.cold is None:
+            return 0
+        cutoff = retention_cutoff(self.retention_days, now)
+        snapshot = list(self._articles.values())
+        moved = 0
+        for start in range(0, len(snapshot), COMPACTION_BATCH_SIZE):
+            batch = [
+                article for article in snapshot[start:start + COMPACTION_BATCH_SIZE]
+                if article["published_date"] < cutoff
+            ]
+            if batch:
+                await asyncio.to_thread(self.cold.put_many, batch)
+                moved += self._evict(batch)
+            await asyncio.sleep(0)
+        # Dicts never shrink on deletion; re-allocate once a quarter of the hot set has turned over
+        if self._evicted_since_rebuild and self._evicted_since_rebuild * 4 >= len(self._articles):
+            self._rebuild_indexes()
+        return moved
+
+    def _evict(self, articles: List[dict]) -> int:
+        """Remove articles from every in-memory index unless they were replaced in the meantime"""
+        gone = [article for article in articles if self._articles.get(article["id"]) is article]
+        if not gone:
+            return 0
+        touched: Dict[str, None] = {}
+        for article in gone:
+            article_id = article["id"]
+            del self._articles[article_id]
+            del self._seqs[article_id]
+            self.entities.remove(article_id)
+            for category in article_categories(article):
+                del self._by_category[category][article_id]
+                touched[category] = None
+        for subset in self.views.remove_many({article["id"] for article in gone}, touched):
+            self._refill_view(subset)
+        self._bump_versions(list(touched))
+        self._evicted_since_rebuild += len(gone)
+        return len(gone)
+
+    def _rebuild_indexes(self):
+        self._articles = dict(self._articles)
+        self._seqs = dict(self._seqs)
+        self._by_category = {category: dict(members) for category, members in self._by_category.items()}
+        self.entities.compact()
+        self._evicted_since_rebuild = 0
+
+    def close(self):
+        if self.cold is not None:
+            self.cold.close()
+
+    def _apply(self, article: dict, keys: Optional[Set[str]], stale_views: Set[FrozenSet[str]]) -> bool:
+        """Write one classified article into every index; True when it replaced an existing one"""
+        article_id = article["id"]
+        previous = self._articles.get(article_id)
+        self._articles[article_id] = article
+        # Updates that leave the text alone keep their keyphrase postings
+        reindex = previous is None or not same_text(previous, article)
+        if previous is not None:
+            if reindex:
+                self.entities.remove(article_id)
+            for category in article_categories(previous):
+                del self._by_category[category][article_id]
+            stale_views.update(self.views.remove(article_id, article_categories(previous)))
+        else:
+            self._seqs[article_id] = next(self._seq)
+        if reindex:
+            self.entities.add(article, keys)
+        for category in article_categories(article):
+            self._by_category.setdefault(category, {})[article_id] = article
+        touched = article_categories(article) + (article_categories(previous) if previous else [])
+        self._bump_versions(touched)
+        self.feed.publish(dict.fromkeys(touched), self.version, article_id)
+        self.views.insert(article, self._seqs[article_id])
+        return previous is not None
+
+    def _refill_view(self, subset: FrozenSet[str]):
+        members = {
+            article["id"]: article for category in subset
+            for article in self._by_category.get(category, {}).values()
+        }
+        self.views.refill(subset, (
+            (article["published_date"], -self._seqs[article_id], article)
+            for article_id, article in members.items()
+        ))
+
+    def _bump_versions(self, categories: List[str]):
+        """Advance the change counter for the whole store and each touched category"""
+        self.version += 1
+        self.modified_at = time.time()
+        for category in categories:
+            self._category_versions[category] = (self.version, self.modified_at)
+
+    def collection_version(self, category: Optional[str] = None) -> Tuple[int, float]:
+        """(change counter, last modified time) of all articles or of one category"""
+        if category is None:
+            return self.version, self.modified_at
+        return self._category_versions.get(category, (0, self.modified_at))
+
+    async def wait_for_changes(self, category: str, since: int,
+                               timeout: float) -> Tuple[int, List[dict], bool]:
+        """Long-poll for articles in `category` changed after `since`
+
+        Returns (cursor, articles, reset); `reset` means the change log no longer reaches
+        back to `since` and the client should refetch the collection.
+        """
+        changed, reset = self.feed.changes_since(category, since)
+        if not changed and not reset and timeout > 0 and await self.feed.wait(category, timeout):
+            changed, reset = self.feed.changes_since(category, since)
+        articles = [
+            self._articles[article_id] for article_id in changed
+            if article_id in self._articles and category in article_categories(self._articles[article_id])
+        ]
+        return self.version, articles, reset
+
+    @staticmethod
+    def project(articles: Iterable[dict], fields: Optional[Sequence[str]] = None) -> List[dict]:
+        """Copy only the requested columns out of stored articles (all columns when `fields` is None)"""
+        if fields is None:
+            return list(articles)
+        return [{field: article.get(field) for field in fields} for article in articles]
+
+    async def all(self, fields: Optional[Sequence[str]] = None) -> List[dict]:
+        """Get all articles in insertion order"""
+        return self.project(self._articles.values(), fields)
+
+    async def by_category(self, category: str, fields: Optional[Sequence[str]] = None) -> List[dict]:
+        """Get all articles of a single category"""
+        return self.project(self._by_category.get(category, {}).values(), fields)
+
+    async def in_categories(self, categories: List[str]) -> List[dict]:
+        """Get all articles belonging to any of the given categories"""
+        matches = {
+            article["id"]: article for category in dict.fromkeys(categories)
+            for article in self._by_category.get(category, {}).values()
+        }
+        return list(matches.values())
+
+    async def latest(self, categories: List[str], limit: int) -> Optional[List[dict]]:
+        """Get the newest articles across categories from the materialized views
+
+        A category set without a view gets one built here, so repeated preferences are
+        answered from the views afterwards; None means the caller must rank candidates itself.
+        """
+        latest = self.views.latest(categories, limit)
+        if latest is None and limit <= self.views.size and self.views.add_lazy(categories):
+            self._refill_view(frozenset(categories))
+            latest = self.views.latest(categories, limit)
+        return latest
+
+    async def about(self, topic: str, limit: int) -> List[dict]:
+        """Get the newest articles whose extracted keyphrases include `topic`"""
+        matches = [self._articles[article_id] for article_id in self.entities.lookup(topic)]
+        return rank_by_recency(matches, limit)
+
+    async def get(self, article_id: int, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
+        """Get a single article by ID, from memory or else from the cold tier"""
+        article = self._articles.get(article_id)
+        if article is None and self.cold is not None:
+            article = await asyncio.to_thread(self.cold.get, article_id)
+        if article is None or fields is None:
+            return article
+        return self.project([article], fields)[0]
+
+# Offloading for CPU-heavy work
+class OffloadQueueFull(Exception):
+    """Raised when the offload pool already has too many pending jobs"""
+
+def rank_by_recency(articles: List[dict], limit: int) -> List[dict]:
+    """Return the `limit` most recent articles (module-level so process pools can pickle it)"""
+    return sorted(articles, key=lambda x: x["published_date"], reverse=True)[:limit]
+
+class OffloadPool:
+    """Bounded executor that keeps CPU-heavy steps off the event loop
+
+    A job counts as pending until the executor has finished (or cancelled) it, not just
+    until its caller stops waiting, so jobs that outlive `timeout` still count toward
+    `max_pending`.
+    """
+    def __init__(self, max_workers: int = 4, max_pending: int = 64, timeout: float = 2.0,
+                 use_processes: bool = False):
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pending = 0
+        self._lock = threading.Lock()
+        executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor: Executor = executor_cls(max_workers=max_workers)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _release(self, _future=None):
+        # Runs on the executor's thread when a job completes
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable, *args):
+        """Run `fn(*args)` in the pool, failing fast when saturated and after `timeout` seconds"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise OffloadQueueFull(f"{self._pending} jobs already pending")
+            self._pending += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        # On timeout the wrapper cancels the job if it has not started yet
+        return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+# Candidate sets larger than this are ranked in the offload pool
+OFFLOAD_THRESHOLD = int(os.environ.get("NEWSBOT_OFFLOAD_THRESHOLD", "500"))
+
+# Conversation sessions
+FOLLOW_UP_RE = re.compile(
+    r"(?:(?:show|tell|give) me |any )?more(?: news| please| of that)?|anything else|what else|next|keep going|continue"
+)
+FOLLOW_UP_PAGE_SIZE = 3
+
+def is_follow_up(message: str) -> bool:
+    """Whether a (lowercased) message only asks to continue the previous answer"""
+    return FOLLOW_UP_RE.fullmatch(message.strip(" ?!.")) is not None
+
+class SessionState:
+    """Per-session conversation state, bounded by `max_shown` remembered article ids
+
+    `shown` spans every query in the session so follow-ups never repeat an article; `cursor`
+    is the position reached in the current query's candidates.
+    """
+    __slots__ = ("intent", "query", "cursor", "shown", "expires_at")
+
+    def __init__(self, max_shown: int):
+        self.intent: Optional[str] = None
+        self.query: Optional[Tuple[str, ...]] = None
+        self.cursor = 0
+        self.shown: deque = deque(maxlen=max_shown)
+        self.expires_at = 0.0
+
+    def advance(self, consumed: int, articles: List[dict]):
+        self.cursor += max(consumed, 0)
+        self.shown.extend(article["id"] for article in articles)
+
+class SessionStore:
+    """LRU of session states with idle TTL; memory is capped at `max_sessions` entries"""
+    def __init__(self, max_sessions: int = 100_000, ttl: float = 1800.0, max_shown: int = 50):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_shown = max_shown
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        """Get a live session and refresh its position and expiry"""
+        state = self._sessions.get(session_id)
+        if state is None:
+            return None
+        now = time.monotonic()
+        if state.expires_at <= now:
+            del self._sessions[session_id]
+            return None
+        state.expires_at = now + self.ttl
+        self._sessions.move_to_end(session_id)
+        return state
+
+    def record(self, session_id: str, intent: str, query: Optional[Tuple[str, ...]], articles: List[dict]):
+        """Start a new query in the session, remembering what was just shown"""
+        state = self.get(session_id)
+        if state is None:
+            state = SessionState(self.max_shown)
+            state.expires_at = time.monotonic() + self.ttl
+            self._sessions[session_id] = state
+            self._evict()
+        state.intent = intent
+        state.query = query
+        state.cursor = 0
+        state.advance(len(articles), articles)
+
+    def _evict(self):
+        """Drop expired sessions from the cold end, then the least recently used over capacity"""
+        now = time.monotonic()
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.expires_at > now:
+                break
+            self._sessions.popitem(last=False)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+# Rate limiting and admission control
+class TokenBucketLimiter:
+    """Per-client token buckets held in fixed-size arrays
+
+    Client keys hash into `slots` buckets, so memory stays constant however many
+    clients appear; colliding clients simply share a bucket.
+    """
+    def __init__(self, rate: float, burst: float, slots: int = 65536):
+        self.rate = rate
+        self.burst = burst
+        self.slots = slots
+        self._tokens = array("d", [burst]) * slots
+        self._updated = array("d", [0.0]) * slots
+
+    def acquire(self, key: str, now: Optional[float] = None) -> float:
+        """Take one token for `key`; return 0 on success or the seconds until one is available"""
+        now = time.monotonic() if now is None else now
+        slot = zlib.crc32(key.encode()) % self.slots
+        tokens = min(self.burst, self._tokens[slot] + (now - self._updated[slot]) * self.rate)
+        self._updated[slot] = now
+        if tokens >= 1.0:
+            self._tokens[slot] = tokens - 1.0
+            return 0.0
+        self._tokens[slot] = tokens
+        return (1.0 - tokens) / self.rate
+
+class AdmissionController:
+    """Global load shedding on in-flight request count and event-loop lag"""
+    def __init__(self, max_in_flight: int = 256, max_lag: float = 0.25, retry_after: int = 1,
+                 probe_interval: float = 0.05):
+        self.max_in_flight = max_in_flight
+        self.max_lag = max_lag
+        self.retry_after = retry_after
+        self.probe_interval = probe_interval
+        self.in_flight = 0
+        self.lag = 0.0
+        self._monitor: Optional[asyncio.Task] = None
+
+    def ensure_monitor(self):
+        """Start the event-loop lag probe on the running loop if it is not already running"""
+        if self._monitor is None or self._monitor.done():
+            self._monitor = asyncio.get_running_loop().create_task(self._probe())
+
+    async def _probe(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.probe_interval)
+            sample = loop.time() - start - self.probe_interval
+            # Decay slowly so a single stall keeps shedding for a few probe intervals
+            self.lag = max(sample, self.lag * 0.5)
+
+    def overload_reason(self) -> Optional[str]:
+        if self.in_flight >= self.max_in_flight:
+            return "too many requests in flight"
+        if self.lag > self.max_lag:
+            return "event loop lagging"
+        return None
+
+def client_key(request: Request) -> str:
+    """Rate-limit key: the caller's address
+
+    Client-chosen headers such as X-API-Key are not authenticated here, so keying on them
+    would let a caller get a fresh bucket per request.
+    """
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+# Popularity tracking
+EVENT_WEIGHTS = {"view": 1.0, "click": 3.0}
+# Weight of log1p(popularity) against one position of recency when re-ranking
+POPULARITY_WEIGHT = float(os.environ.get("NEWSBOT_POPULARITY_WEIGHT", "1.0"))
+
+class DecayedCountMinSketch:
+    """Count-Min Sketch split into time buckets whose counts decay geometrically with age
+
+    Memory is `buckets * depth * width` doubles regardless of traffic. The current bucket
+    collects events for `window` seconds; on rotation the oldest bucket is cleared and reused.
+    """
+    def __init__(self, width: int = 2048, depth: int = 4, buckets: int = 6, window: float = 600.0,
+                 decay: float = 0.5):
+        self.width = width
+        self.depth = depth
+        self.buckets = buckets
+        self.window = window
+        self.decay = decay
+        self.generation = 0
+        self._tables = [array("d", [0.0]) * (width * depth) for _ in range(buckets)]
+        self._current = 0
+        self._window_start = time.monotonic()
+
+    def _rotate(self, now: float):
+        elapsed = int((now - self._window_start) // self.window)
+        if elapsed <= 0:
+            return
+        for _ in range(min(elapsed, self.buckets)):
+            self._current = (self._current + 1) % self.buckets
+            self._tables[self._current] = array("d", [0.0]) * (self.width * self.depth)
+        self._window_start += elapsed * self.window
+        self.generation += 1
+
+    def _slots(self, key: bytes) -> List[int]:
+        return [row * self.width + zlib.crc32(key, row * 0x9E3779B1 & 0xFFFFFFFF) % self.width
+                for row in range(self.depth)]
+
+    def add(self, key: bytes, amount: float = 1.0, now: Optional[float] = None):
+        self._rotate(time.monotonic() if now is None else now)
+        table = self._tables[self._current]
+        for slot in self._slots(key):
+            table[slot] += amount
+
+    def estimate(self, key: bytes, now: Optional[float] = None) -> float:
+        self._rotate(time.monotonic() if now is None else now)
+        slots = self._slots(key)
+        total = 0.0
+        for offset in range(self.buckets):
+            table = self._tables[(self._current - offset) % self.buckets]
+            total += self.decay ** offset * min(table[slot] for slot in slots)
+        return total
+
+class PopularityTracker:
+    """Decayed engagement counts plus a fixed-size heavy-hitters set per category"""
+    def __init__(self, sketch: Optional[DecayedCountMinSketch] = None, top_k: int = 20):
+        self.sketch = sketch or DecayedCountMinSketch()
+        self.top_k = top_k
+        self.events = 0
+        self._candidates: Dict[str, Dict[int, float]] = {}
+        self._generation = self.sketch.generation
+
+    @staticmethod
+    def _key(article_id: int) -> bytes:
+        return str(article_id).encode()
+
+    def score(self, article_id: int) -> float:
+        return self.sketch.estimate(self._key(article_id))
+
+    def _refresh(self):
+        """Re-estimate candidates after a bucket rotation so evictions compare current scores"""
+        if self._generation == self.sketch.generation:
+            return
+        self._generation = self.sketch.generation
+        for candidates in self._candidates.values():
+            for article_id in candidates:
+                candidates[article_id] = self.score(article_id)
+
+    def record(self, article: dict, event_type: str):
+        article_id = article["id"]
+        self.sketch.add(self._key(article_id), EVENT_WEIGHTS[event_type])
+        self.events += 1
+        self._refresh()
+        estimate = self.score(article_id)
+        for category in article_categories(article):
+            candidates = self._candidates.setdefault(category, {})
+            if article_id in candidates or len(candidates) < self.top_k:
+                candidates[article_id] = estimate
+                continue
+            weakest = min(candidates, key=candidates.__getitem__)
+            if estimate > candidates[weakest]:
+                del candidates[weakest]
+                candidates[article_id] = estimate
+
+    def trending(self, categories: Iterable[str], limit: int) -> List[Tuple[int, float]]:
+        """Top (article id, score) pairs across the given categories, best first"""
+        self._refresh()
+        ids = {article_id for category in categories for article_id in self._candidates.get(category, ())}
+        scored = [(article_id, self.score(article_id)) for article_id in ids]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return [item for item in scored[:limit] if item[1] > 0]
+
+    def rerank(self, articles: List[dict], limit: int) -> List[dict]:
+        """Blend recency order with popularity; a no-op until any engagement is recorded"""
+        if not self.events:
+            return articles[:limit]
+        scored = [
+            (POPULARITY_WEIGHT * math.log1p(self.score(article["id"])) - position, article)
+            for position, article in enumerate(articles)
+        ]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [article for _, article in scored[:limit]]
+
 # Chatbot responses and logic
 class NewsBot:
-    def __init__(self):
-        self.news_data = MOCK_NEWS_DATA
+    def __init__(self, store: Optional[NewsStore] = None, pool: Optional[OffloadPool] = None,
+                 sessions: Optional[SessionStore] = None, popularity: Optional[PopularityTracker] = None):
+        self.store = store or NewsStore(MOCK_NEWS_DATA)
+        self.popularity = popularity or PopularityTracker()
+        self.pool = pool or OffloadPool(
+            max_workers=int(os.environ.get("NEWSBOT_POOL_WORKERS", "4")),
+            max_pending=int(os.environ.get("NEWSBOT_POOL_MAX_PENDING", "64")),
+            timeout=float(os.environ.get("NEWSBOT_POOL_TIMEOUT", "2.0")),
+        )
+        self.sessions = sessions if sessions is not None else SessionStore(
+            max_sessions=int(os.environ.get("NEWSBOT_MAX_SESSIONS", "100000")),
+            ttl=float(os.environ.get("NEWSBOT_SESSION_TTL", "1800")),
+        )
         self.greetings = {
             "hello": ["Hello! 👋", "Hi there! 👋", "Hey! How can I help you today? 👋"],
             "how are you": ["I'm doing great, thanks for asking! How can I assist you with news today?", 
@@ -357,15 +1440,34 @@ class NewsBot:
             "good evening": ["Good evening! 🌙 Let's catch up on today's news.", 
                            "Evening! What would you like to know about?"]
         }
+        self.category_responses = {
+            "tech": ("Here are the latest technology updates:", ["tech"]),
+            "technology": ("Here are the latest technology updates:", ["tech"]),
+            "politics": ("Here are the latest political updates:", ["politics"]),
+            "political": ("Here are the latest political updates:", ["politics"]),
+            "finance": ("Here are the latest financial updates:", ["finance"]),
+            "financial": ("Here are the latest financial updates:", ["finance"]),
+            "market": ("Here are the latest market updates:", ["finance"])
+        }
+        for category in self.store.classifier.categories:
+            self.category_responses.setdefault(category, (f"Here are the latest {category} updates:", [category]))
         
-    def get_personalized_news(self, categories: List[str], limit: int = 5) -> List[dict]:
+    async def get_personalized_news(self, categories: List[str], limit: int = 5) -> List[dict]:
         """Get personalized news based on user preferences"""
-        filtered_news = [
-            article for article in self.news_data 
-            if article["category"] in categories
-        ]
-        sorted_news = sorted(filtered_news, key=lambda x: x["published_date"], reverse=True)
-        return sorted_news[:limit]
+        pool_size = max(limit, self.store.views.size) if self.popularity.events else limit
+        latest = await self.store.latest(categories, pool_size)
+        if latest is None:
+            filtered_news = await self.store.in_categories(categories)
+            if len(filtered_news) > OFFLOAD_THRESHOLD:
+                latest = await self.pool.run(rank_by_recency, filtered_news, pool_size)
+            else:
+                latest = rank_by_recency(filtered_news, pool_size)
+        return self.popularity.rerank(latest, limit)
+    
+    async def get_trending_news(self, categories: List[str], limit: int = 5) -> List[dict]:
+        """Get the most engaged-with articles in the given categories"""
+        articles = [await self.store.get(article_id) for article_id, _ in self.popularity.trending(categories, limit)]
+        return [article for article in articles if article is not None]
     
     def get_greeting_response(self, message: str) -> Optional[str]:
         """Get a contextual greeting response"""
@@ -375,8 +1477,59 @@ class NewsBot:
                 return random.choice(responses)
         return None
     
-    def generate_response(self, message: str, preferences: List[str]) -> ChatResponse:
-        """Generate chatbot response based on user message"""
+    async def generate_response(self, message: str, preferences: List[str],
+                                session_id: Optional[str] = None,
+                                fields: Optional[Sequence[str]] = None) -> ChatResponse:
+        """Generate chatbot response based on user message, continuing the session on follow-ups"""
+        session = self.sessions.get(session_id) if session_id else None
+        if session is not None and session.query is not None and is_follow_up(message.lower()):
+            response = await self.continue_session(session)
+        else:
+            response, intent, query = await self._respond(message, preferences)
+            if session_id:
+                self.sessions.record(session_id, intent, query, response.news_articles or [])
+        if fields is not None and response.news_articles:
+            response.news_articles = self.store.project(response.news_articles, fields)
+        return response
+    
+    async def articles_for(self, query: Tuple[str, ...], limit: int) -> List[dict]:
+        """Re-run a remembered query for follow-up pagination"""
+        kind, *args = query
+        if kind == "topic":
+            return await self.store.about(args[0], limit)
+        if kind == "trending":
+            return await self.get_trending_news(list(args), limit)
+        return await self.get_personalized_news(list(args), limit)
+    
+    async def continue_session(self, session: "SessionState") -> ChatResponse:
+        """Return the next page of the session's last query
+
+        Deduplication is session-wide: articles shown for any earlier query in the session are
+        skipped too. The candidate window widens until a full page of unseen articles is found
+        or the query runs out of candidates.
+        """
+        window = session.cursor + FOLLOW_UP_PAGE_SIZE
+        while True:
+            candidates = await self.articles_for(session.query, window)
+            exhausted = len(candidates) < window
+            fresh: List[dict] = []
+            consumed = 0
+            for article in candidates[session.cursor:]:
+                consumed += 1
+                if article["id"] not in session.shown:
+                    fresh.append(article)
+                    if len(fresh) == FOLLOW_UP_PAGE_SIZE:
+                        break
+            if len(fresh) == FOLLOW_UP_PAGE_SIZE or exhausted:
+                break
+            window *= 2
+        session.advance(consumed, fresh)
+        if not fresh:
+            return ChatResponse(response="That's everything I have on that for now. Try asking about another topic!")
+        return ChatResponse(response="Here's more on that:", news_articles=fresh)
+    
+    async def _respond(self, message: str, preferences: List[str]) -> Tuple[ChatResponse, str, Optional[Tuple[str, ...]]]:
+        """Answer a fresh message, returning the response with its intent and re-runnable query"""
         message_lower = message.lower()
         
         # Check for greetings first
@@ -384,8 +1537,27 @@ class NewsBot:
         if greeting_response:
             return ChatResponse(
                 response=greeting_response,
-                news_articles=self.get_personalized_news(preferences, 2)
-            )
+                news_articles=await self.get_personalized_news(preferences, 2)
+            ), "greeting", ("categories", *preferences)
+        
+        # Topic requests ("tell me about X", "show me X") resolved through the entity index
+        topic = extract_topic_query(message_lower)
+        if topic and topic not in self.category_responses:
+            matches = await self.store.about(topic, 4)
+            if matches:
+                return ChatResponse(
+                    response="Here's what I found about that:",
+                    news_articles=matches
+                ), "topic", ("topic", topic)
+        
+        # Trending requests
+        if any(phrase in message_lower for phrase in ("trending", "popular", "most read")):
+            trending = await self.get_trending_news(preferences, 4)
+            if trending:
+                return ChatResponse(
+                    response="Here's what readers are engaging with most right now:",
+                    news_articles=trending
+                ), "trending", ("trending", *preferences)
         
         # News request patterns
         news_patterns = {
@@ -401,44 +1573,552 @@ class NewsBot:
             if pattern in message_lower:
                 return ChatResponse(
                     response=response,
-                    news_articles=self.get_personalized_news(preferences, 4)
-                )
+                    news_articles=await self.get_personalized_news(preferences, 4)
+                ), "news", ("categories", *preferences)
         
         # Category-specific requests
-        category_responses = {
-            "tech": ("Here are the latest technology updates:", ["tech"]),
-            "technology": ("Here are the latest technology updates:", ["tech"]),
-            "politics": ("Here are the latest political updates:", ["politics"]),
-            "political": ("Here are the latest political updates:", ["politics"]),
-            "finance": ("Here are the latest financial updates:", ["finance"]),
-            "financial": ("Here are the latest financial updates:", ["finance"]),
-            "market": ("Here are the latest market updates:", ["finance"])
-        }
-        
-        for keyword, (response, categories) in category_responses.items():
+        for keyword, (response, categories) in self.category_responses.items():
             if keyword in message_lower:
                 return ChatResponse(
                     response=response,
-                    news_articles=self.get_personalized_news(categories, 4)
-                )
+                    news_articles=await self.get_personalized_news(categories, 4)
+                ), "category", ("categories", *categories)
         
         # Help request
         if "help" in message_lower or "what can you do" in message_lower:
             return ChatResponse(
                 response="I can help you with:\n• Latest news in tech, politics, and finance\n• Personalized news based on your preferences\n• Specific category updates\n• Just ask me about any topic you're interested in!\n\nTry asking me about the latest tech news, political updates, or financial market trends!"
-            )
+            ), "help", None
         
         # Default response with contextual news
         return ChatResponse(
             response="I understand you're interested in news. Here are some relevant updates that might interest you:",
-            news_articles=self.get_personalized_news(preferences, 3)
-        )
+            news_articles=await self.get_personalized_news(preferences, 3)
+        ), "default", ("categories", *preferences)
+
+# Response compression
+ENCODERS: Dict[str, Callable[[bytes, int], bytes]] = {
+    "gzip": lambda data, level: gzip.compress(data, compresslevel=level, mtime=0),
+}
+if brotli is not None:
+    ENCODERS["br"] = lambda data, level: brotli.compress(data, quality=level, mode=brotli.MODE_TEXT)
+if zstandard is not None:
+    ENCODERS["zstd"] = lambda data, level: zstandard.ZstdCompressor(level=level).compress(data)
+
+# Server preference when the client accepts several encodings equally
+ENCODING_PREFERENCE = ["zstd", "br", "gzip"]
+COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain", "text/css", "application/javascript")
+
+class CompressionSettings(BaseModel):
+    min_size: int = 1024
+    levels: Dict[str, int] = {"zstd": 3, "br": 5, "gzip": 6}
+
+# Longest matching path prefix wins; unmatched paths are never compressed
+COMPRESSION_SETTINGS = {
+    "/": CompressionSettings(),
+    "/news": CompressionSettings(min_size=1024, levels={"zstd": 3, "br": 6, "gzip": 6}),
+    "/chat": CompressionSettings(min_size=512, levels={"zstd": 3, "br": 4, "gzip": 5}),
+}
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """Pick the best available encoding for an Accept-Encoding header, honouring q-values"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in available:
+            continue
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+class CompressionMiddleware:
+    """ASGI middleware compressing buffered responses with gzip, brotli or zstd
+
+    Responses carrying an ETag are cacheable collections: their compressed bytes are kept
+    in a small LRU keyed by (path, ETag, encoding) and reused until the ETag changes.
+    """
+    def __init__(self, app, settings: Dict[str, CompressionSettings], cache_size: int = 256):
+        self.app = app
+        self.settings = sorted(settings.items(), key=lambda item: len(item[0]), reverse=True)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+
+    def settings_for(self, path: str) -> Optional[CompressionSettings]:
+        for prefix, settings in self.settings:
+            if path.startswith(prefix):
+                return settings
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        settings = self.settings_for(scope["path"])
+        encoding = None
+        if settings is not None:
+            available = [name for name in settings.levels if name in ENCODERS]
+            encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), available)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[dict] = None
+        passthrough = False
+        chunks: List[bytes] = []
+
+        async def buffered_send(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                )
+                if message["status"] == 304:
+                    # Revalidates the encoded 200, so it must carry the same validator and Vary
+                    self._mark_encoded(MutableHeaders(raw=message["headers"]))
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            await self._send_compressed(scope["path"], start, b"".join(chunks), encoding, settings, send)
+
+        await self.app(scope, receive, buffered_send)
+
+    async def _send_compressed(self, path: str, start: dict, body: bytes, encoding: str,
+                               settings: CompressionSettings, send):
+        headers = MutableHeaders(raw=start["headers"])
+        etag = headers.get("etag")
+        self._mark_encoded(headers)
+        if len(body) >= settings.min_size:
+            body = self._compress(path, etag, body, encoding, settings.levels[encoding])
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+        await send(start)
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _mark_encoded(headers: MutableHeaders):
+        """Headers shared by a negotiated response and the 304s revalidating it
+
+        The representation may differ from the identity one, so its tag is only weakly equal.
+        Small bodies sent uncompressed get the same weak tag, so a 304 never has to know the size.
+        """
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+
+    def _compress(self, path: str, etag: Optional[str], body: bytes, encoding: str, level: int) -> bytes:
+        if not etag:
+            return ENCODERS[encoding](body, level)
+        key = (path, etag, encoding)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        compressed = ENCODERS[encoding](body, level)
+        self._cache[key] = compressed
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return compressed
+
+# Traffic capture
+CAPTURED_PREFIXES = ("/chat", "/news")
+# Long-poll and SSE subscriptions stay open until the client leaves, so they cannot be replayed
+UNCAPTURED_SUFFIXES = ("/updates", "/stream")
+CAPTURED_HEADERS = ("accept-encoding", "if-none-match", "if-modified-since")
+# Request and response bodies above this size are recorded by hash only
+MAX_CAPTURED_BODY = 64 * 1024
+
+class CapturedBody:
+    """Running hash of a message body that keeps the bytes only while they fit in MAX_CAPTURED_BODY"""
+    __slots__ = ("digest", "size", "chunks")
+
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.chunks: List[bytes] = []
+
+    def append(self, chunk: bytes):
+        self.digest.update(chunk)
+        self.size += len(chunk)
+        if self.size <= MAX_CAPTURED_BODY:
+            self.chunks.append(chunk)
+        else:
+            self.chunks = []
+
+    def text(self) -> Optional[str]:
+        """The body as text, or None when it was too large to keep"""
+        if self.size > MAX_CAPTURED_BODY:
+            return None
+        return b"".join(self.chunks).decode("utf-8", "replace")
+
+class TrafficRecorder:
+    """Appends captured request records to a JSONL file from a background writer thread
+
+    The event loop only enqueues; when the bounded queue is full records are dropped
+    (and counted) rather than stalling requests on disk I/O.
+    """
+    def __init__(self, path: str, sample_rate: float = 1.0, max_queue: int = 10_000):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def record(self, entry: dict):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._write_loop, name="traffic-recorder", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                entry = self._queue.get()
+                if entry is None:
+                    break
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+class TrafficCaptureMiddleware:
+    """ASGI middleware sampling /chat and /news* exchanges into a TrafficRecorder"""
+    def __init__(self, app, recorder: TrafficRecorder):
+        self.app = app
+        self.recorder = recorder
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or not scope["path"].startswith(CAPTURED_PREFIXES)
+                or scope["path"].endswith(UNCAPTURED_SUFFIXES) or not self.recorder.sampled()):
+            await self.app(scope, receive, send)
+            return
+
+        started_wall = time.time()
+        started = time.perf_counter()
+        request_body = CapturedBody()
+        response_body = CapturedBody()
+        status = 0
+
+        async def capturing_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                request_body.append(message.get("body", b""))
+            return message
+
+        async def capturing_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, capturing_receive, capturing_send)
+        finally:
+            headers = Headers(scope=scope)
+            entry = {
+                "ts": started_wall,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "headers": {name: headers[name] for name in CAPTURED_HEADERS if name in headers},
+                "body_sha256": request_body.digest.hexdigest(),
+                "status": status,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+                "response_sha256": response_body.digest.hexdigest(),
+            }
+            for key, captured in (("body", request_body), ("response", response_body)):
+                text = captured.text()
+                if text is not None:
+                    entry[key] = text
+            self.recorder.record(entry)
+
+def default_recorder() -> Optional[TrafficRecorder]:
+    """Capture is enabled by setting NEWSBOT_CAPTURE_PATH"""
+    path = os.environ.get("NEWSBOT_CAPTURE_PATH")
+    if not path:
+        return None
+    return TrafficRecorder(path, sample_rate=float(os.environ.get("NEWSBOT_CAPTURE_SAMPLE", "1.0")))
+
+# Bulk ingestion
+BULK_BATCH_SIZE = int(os.environ.get("NEWSBOT_BULK_BATCH_SIZE", "2000"))
+# Per-record errors beyond this are counted but not listed
+MAX_BULK_ERRORS = 1000
+BULK_BATCH_ADAPTER = TypeAdapter(List[BulkNewsArticle])
+
+async def ndjson_batches(chunks, batch_size: int):
+    """Split a streamed NDJSON body into batches of (line number, raw line), skipping blank lines"""
+    batch: List[Tuple[int, bytes]] = []
+    pending = b""
+    line_no = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                batch.append((line_no, line))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+    if pending.strip():
+        batch.append((line_no + 1, pending))
+    if batch:
+        yield batch
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in e['loc']) or 'record'}: {e['msg']}" for e in error.errors())
+
+def check_categories(article: dict, known: Set[str]) -> Optional[str]:
+    """Refuse labels outside the configured categories and put `category` first in `categories`
+
+    A record with only `categories` takes its first label as `category`; only records with
+    no labels at all are left for the classifier.
+    """
+    labels = list(dict.fromkeys(([article["category"]] if article["category"] else []) + (article["categories"] or [])))
+    unknown = [label for label in labels if label not in known]
+    if unknown:
+        return f"unknown category {unknown[0]!r}; expected one of {', '.join(sorted(known))}"
+    # Single-label records keep only `category`
+    del article["categories"]
+    if labels:
+        article["category"] = labels[0]
+    if len(labels) > 1:
+        article["categories"] = labels
+    return None
+
+def validate_batch(batch: List[Tuple[int, bytes]],
+                   known_categories: Set[str]) -> Tuple[List[dict], List[BulkRecordError]]:
+    """Validate a batch in one pass; only a failing batch is re-checked record by record"""
+    validated: List[Tuple[int, dict]] = []
+    errors: List[BulkRecordError] = []
+    try:
+        records = BULK_BATCH_ADAPTER.validate_json(b"[" + b",".join(line for _, line in batch) + b"]")
+    except ValidationError:
+        records = None
+    # A line such as `{...},{...}` joins into two records; only a one-to-one result is trusted
+    if records is not None and len(records) == len(batch):
+        validated = [(line_no, record.model_dump()) for (line_no, _), record in zip(batch, records)]
+    else:
+        validated, errors = _validate_lines(batch)
+    articles = []
+    for line_no, article in validated:
+        error = check_categories(article, known_categories)
+        if error:
+            errors.append(BulkRecordError(line=line_no, error=error))
+        else:
+            articles.append(article)
+    errors.sort(key=lambda error: error.line)
+    return articles, errors
+
+def _validate_lines(batch: List[Tuple[int, bytes]]) -> Tuple[List[Tuple[int, dict]], List[BulkRecordError]]:
+    errors: List[BulkRecordError] = []
+    decoded: List[Tuple[int, object]] = []
+    for line_no, line in batch:
+        try:
+            decoded.append((line_no, json.loads(line)))
+        except ValueError as e:
+            errors.append(BulkRecordError(line=line_no, error=f"invalid JSON: {e}"))
+    validated = []
+    for line_no, record in decoded:
+        try:
+            validated.append((line_no, BulkNewsArticle.model_validate(record).model_dump()))
+        except ValidationError as e:
+            errors.append(BulkRecordError(line=line_no, error=_validation_message(e)))
+    return validated, errors
+
+# Application state
+SSE_HEARTBEAT_SECONDS = 15.0
+SSE_RETRY_MS = 3000
+# Distinguishes ETags issued by this process from those of earlier runs whose counters restarted
+STORE_EPOCH = format(int(time.time()), "x")
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+# How long a request waits for the bot to finish loading before getting a 503
+STARTUP_WAIT_SECONDS = float(os.environ.get("NEWSBOT_STARTUP_WAIT", "10"))
+
+class NewsBotLoader:
+    """Builds the NewsBot once, in a worker thread, and lets requests wait for it
+
+    Loading starts from the lifespan hook, or from the first request when the app
+    is served without lifespan events (e.g. httpx.ASGITransport).
+    """
+    def __init__(self, factory: Callable[[], "NewsBot"], bot: Optional["NewsBot"] = None):
+        self.factory = factory
+        self.bot = bot
+        self.error: Optional[BaseException] = None
+        self.load_seconds: Optional[float] = 0.0 if bot is not None else None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.bot is not None
+
+    def start(self):
+        if self.bot is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is not loop:
+            # The loop that started loading has gone away (e.g. a test client per request)
+            self._task = None
+        if self._task is None:
+            self._task = loop.create_task(self._load())
+
+    async def _load(self):
+        started = time.perf_counter()
+        try:
+            self.bot = await asyncio.to_thread(self.factory)
+        except Exception as e:
+            self.error = e
+            raise
+        self.load_seconds = time.perf_counter() - started
+
+    async def get(self, timeout: Optional[float]) -> "NewsBot":
+        if self.bot is not None:
+            return self.bot
+        self.start()
+        await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        return self.bot
 
-# Initialize the bot
-news_bot = NewsBot()
+    def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        if self.bot is not None:
+            self.bot.pool.shutdown()
+            self.bot.store.close()
+
+async def get_news_bot(request: Request) -> NewsBot:
+    """Dependency returning the loaded bot, or 503 while it is still starting"""
+    try:
+        return await request.app.state.loader.get(STARTUP_WAIT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Service is starting up, please retry shortly",
+                            headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Service failed to start: {str(e)}")
+
+async def compact_periodically(loader: NewsBotLoader, interval: float = COMPACTION_INTERVAL):
+    """Background task moving aged-out articles to the cold tier once the bot has loaded"""
+    try:
+        bot = await loader.get(timeout=None)
+    except Exception:
+        return  # the load error is reported by /ready
+    if bot.store.cold is None:
+        return
+    while True:
+        try:
+            await bot.store.compact()
+        except Exception:
+            # A failed pass leaves both tiers consistent; the next one retries
+            logger.exception("Article compaction failed")
+        await asyncio.sleep(interval)
+
+def default_rate_limiter() -> TokenBucketLimiter:
+    return TokenBucketLimiter(
+        rate=float(os.environ.get("NEWSBOT_CHAT_RATE", "5")),
+        burst=float(os.environ.get("NEWSBOT_CHAT_BURST", "20")),
+    )
+
+def default_admission() -> AdmissionController:
+    return AdmissionController(
+        max_in_flight=int(os.environ.get("NEWSBOT_MAX_IN_FLIGHT", "256")),
+        max_lag=float(os.environ.get("NEWSBOT_MAX_LOOP_LAG", "0.25")),
+    )
+
+async def admit_chat(request: Request):
+    """Shed load with 503 when overloaded and throttle each client with 429"""
+    admission = request.app.state.admission
+    admission.ensure_monitor()
+    reason = admission.overload_reason()
+    if reason:
+        raise HTTPException(status_code=503, detail=f"Server overloaded ({reason}), please retry shortly",
+                            headers={"Retry-After": str(admission.retry_after)})
+    wait = request.app.state.rate_limiter.acquire(client_key(request))
+    if wait:
+        raise HTTPException(status_code=429, detail="Rate limit exceeded",
+                            headers={"Retry-After": str(math.ceil(wait))})
+    admission.in_flight += 1
+    try:
+        yield
+    finally:
+        admission.in_flight -= 1
+
+# Conditional GET support for collection endpoints
+def collection_validators(scope: str, version: Tuple[int, float]) -> Dict[str, str]:
+    """ETag / Last-Modified headers for a collection at a given store version
+
+    Last-Modified has one-second resolution, so while the last write is in the current second
+    another write could still land under the same value. It is withheld until that second
+    has passed; the ETag validates in the meantime.
+    """
+    counter, modified_at = version
+    validators = {
+        "ETag": f'"{scope}-{STORE_EPOCH}-{counter}"',
+        "Cache-Control": "no-cache",
+    }
+    if int(modified_at) < int(time.time()):
+        validators["Last-Modified"] = formatdate(modified_at, usegmt=True)
+    return validators
+
+def is_not_modified(request: Request, validators: Dict[str, str]) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the validators"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = validators["ETag"]
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    # Without Last-Modified the last write is in the current second and IMS cannot rule out a change
+    if if_modified_since is None or "Last-Modified" not in validators:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return int(parsedate_to_datetime(validators["Last-Modified"]).timestamp()) <= int(since.timestamp())
 
 # API Routes
-@app.get("/", response_class=HTMLResponse)
+router = APIRouter()
+
+@router.get("/", response_class=HTMLResponse)
 async def get_homepage():
     """Serve the main HTML page"""
     html_content = """
@@ -839,6 +2519,7 @@ async def get_homepage():
             const messageInput = document.getElementById('user-input');
             const sendButton = document.getElementById('send-button');
             const typingIndicator = document.getElementById('typing-indicator');
+            const sessionId = (window.crypto && crypto.randomUUID) ? crypto.randomUUID() : String(Date.now()) + Math.random();
             
             function getSelectedPreferences() {
                 const preferences = [];
@@ -910,7 +2591,8 @@ async def get_homepage():
                         },
                         body: JSON.stringify({
                             message: message,
-                            user_preferences: preferences
+                            user_preferences: preferences,
+                            session_id: sessionId
                         })
                     });
                     
@@ -951,42 +2633,215 @@ async def get_homepage():
     """
     return HTMLResponse(content=html_content)
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(message: ChatMessage):
+@router.post("/chat", response_model=ChatResponse, dependencies=[Depends(admit_chat)])
+async def chat_endpoint(message: ChatMessage, request: Request, news_bot: NewsBot = Depends(get_news_bot)):
     """Main chat endpoint"""
+    fields = parse_fields(message.fields)
     try:
-        response = news_bot.generate_response(message.message, message.user_preferences)
+        response = await news_bot.generate_response(message.message, message.user_preferences,
+                                                    message.session_id, fields)
         return response
+    except OffloadQueueFull:
+        raise HTTPException(status_code=503, detail="Server busy, please retry shortly",
+                            headers={"Retry-After": str(request.app.state.admission.retry_after)})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out processing message")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
 
-@app.get("/news", response_model=List[NewsArticle])
-async def get_all_news():
+ARTICLE_FIELDS = tuple(NewsArticle.model_fields)
+
+def parse_fields(fields) -> Optional[Tuple[str, ...]]:
+    """Validate a sparse fieldset given as "a,b,c" or a list; None selects every field"""
+    if fields is None:
+        return None
+    names = fields.split(",") if isinstance(fields, str) else fields
+    selected = tuple(dict.fromkeys(name.strip() for name in names if name.strip()))
+    unknown = [name for name in selected if name not in ARTICLE_FIELDS]
+    if unknown or not selected:
+        raise HTTPException(status_code=400,
+                            detail=f"Invalid fields: {', '.join(unknown) or '(none)'}. Use: {', '.join(ARTICLE_FIELDS)}")
+    return selected
+
+def fieldset_scope(scope: str, fields: Optional[Tuple[str, ...]]) -> str:
+    """Validator scope for a projected collection, so each fieldset gets its own ETag"""
+    return scope if fields is None else f"{scope};{'+'.join(fields)}"
+
+def validate_category(news_bot: NewsBot, category: str):
+    categories = news_bot.store.classifier.categories
+    if category not in categories:
+        raise HTTPException(status_code=400, detail=f"Invalid category. Use: {', '.join(categories)}")
+
+@router.get("/news", response_model=List[NewsArticle], response_model_exclude_none=True)
+async def get_all_news(request: Request, response: Response, fields: Optional[str] = None,
+                       news_bot: NewsBot = Depends(get_news_bot)):
     """Get all news articles"""
-    return MOCK_NEWS_DATA
+    selected = parse_fields(fields)
+    validators = collection_validators(fieldset_scope("all", selected), news_bot.store.collection_version())
+    if is_not_modified(request, validators):
+        return Response(status_code=304, headers=validators)
+    articles = await news_bot.store.all(selected)
+    if selected is not None:
+        return JSONResponse(content=articles, headers=validators)
+    response.headers.update(validators)
+    return articles
 
-@app.get("/news/{category}", response_model=List[NewsArticle])
-async def get_news_by_category(category: str):
+@router.get("/news/trending", response_model=List[NewsArticle], response_model_exclude_none=True)
+async def get_trending_news(category: Optional[str] = None, limit: int = Query(10, ge=1, le=50),
+                            fields: Optional[str] = None, news_bot: NewsBot = Depends(get_news_bot)):
+    """Get the most engaged-with articles, optionally within one category"""
+    if category is not None:
+        validate_category(news_bot, category)
+    selected = parse_fields(fields)
+    categories = [category] if category else news_bot.store.classifier.categories
+    articles = news_bot.store.project(await news_bot.get_trending_news(categories, limit), selected)
+    if selected is not None:
+        return JSONResponse(content=articles)
+    return articles
+
+@router.get("/news/{category}", response_model=List[NewsArticle], response_model_exclude_none=True)
+async def get_news_by_category(category: str, request: Request, response: Response,
+                               fields: Optional[str] = None, news_bot: NewsBot = Depends(get_news_bot)):
     """Get news articles by category"""
-    if category not in ["tech", "politics", "finance"]:
-        raise HTTPException(status_code=400, detail="Invalid category. Use: tech, politics, or finance")
+    validate_category(news_bot, category)
+    selected = parse_fields(fields)
     
-    filtered_news = [article for article in MOCK_NEWS_DATA if article["category"] == category]
-    return filtered_news
+    validators = collection_validators(fieldset_scope(category, selected),
+                                       news_bot.store.collection_version(category))
+    if is_not_modified(request, validators):
+        return Response(status_code=304, headers=validators)
+    articles = await news_bot.store.by_category(category, selected)
+    if selected is not None:
+        return JSONResponse(content=articles, headers=validators)
+    response.headers.update(validators)
+    return articles
+
+@router.get("/news/{category}/updates", response_model=NewsUpdates, response_model_exclude_none=True)
+async def poll_news_updates(category: str, since: Optional[int] = None,
+                            timeout: float = Query(30.0, ge=0, le=60), news_bot: NewsBot = Depends(get_news_bot)):
+    """Long-poll for new articles in a category after the `since` cursor"""
+    validate_category(news_bot, category)
+    store = news_bot.store
+    cursor, articles, reset = await store.wait_for_changes(
+        category, store.version if since is None else since, timeout)
+    return NewsUpdates(cursor=cursor, articles=articles, reset=reset)
 
-@app.get("/news/article/{article_id}", response_model=NewsArticle)
-async def get_news_article(article_id: int):
+@router.get("/news/{category}/stream")
+async def stream_news_updates(category: str, request: Request, since: Optional[int] = None,
+                              news_bot: NewsBot = Depends(get_news_bot)):
+    """Server-sent events stream of new articles in a category"""
+    validate_category(news_bot, category)
+    store = news_bot.store
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    cursor = store.version if since is None else since
+
+    async def events():
+        nonlocal cursor
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while not await request.is_disconnected():
+            cursor, articles, reset = await store.wait_for_changes(category, cursor, SSE_HEARTBEAT_SECONDS)
+            if reset:
+                yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+            for article in articles:
+                yield f"id: {cursor}\nevent: article\ndata: {json.dumps(article)}\n\n"
+            if not articles and not reset:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/news/article/{article_id}", response_model=NewsArticle, response_model_exclude_none=True)
+async def get_news_article(article_id: int, fields: Optional[str] = None, news_bot: NewsBot = Depends(get_news_bot)):
     """Get a specific news article by ID"""
-    article = next((article for article in MOCK_NEWS_DATA if article["id"] == article_id), None)
+    selected = parse_fields(fields)
+    article = await news_bot.store.get(article_id, selected)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
+    if selected is not None:
+        return JSONResponse(content=article)
     return article
 
-@app.get("/health")
+@router.post("/news/bulk", response_model=BulkIngestResult)
+async def bulk_ingest(request: Request, news_bot: NewsBot = Depends(get_news_bot)):
+    """Upsert a stream of NDJSON NewsArticle records, validated and written in batches"""
+    result = BulkIngestResult()
+    known_categories = set(news_bot.store.classifier.categories)
+    async for batch in ndjson_batches(request.stream(), BULK_BATCH_SIZE):
+        # Parsing, classification and keyphrase extraction run in worker threads; only the
+        # index updates of each batch happen on the event loop
+        articles, errors = await asyncio.to_thread(validate_batch, batch, known_categories)
+        inserted, updated = await news_bot.store.upsert(articles)
+        result.received += len(batch)
+        result.inserted += inserted
+        result.updated += updated
+        result.failed += len(errors)
+        result.errors.extend(errors[:MAX_BULK_ERRORS - len(result.errors)])
+    return result
+
+@router.post("/news/article/{article_id}/events", status_code=202)
+async def record_engagement(article_id: int, event: EngagementEvent, news_bot: NewsBot = Depends(get_news_bot)):
+    """Record a view or click on an article for trending and ranking"""
+    article = await news_bot.store.get(article_id)
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    news_bot.popularity.record(article, event.type)
+    return {"status": "recorded"}
+
+@router.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "AI News Chatbot is running!"}
 
+@router.get("/ready")
+async def readiness_check(request: Request):
+    """Readiness endpoint: 200 once articles and indexes are loaded, 503 until then"""
+    loader: NewsBotLoader = request.app.state.loader
+    if not loader.ready:
+        loader.start()
+        detail = f"failed: {loader.error}" if loader.error else "loading"
+        return JSONResponse(status_code=503, content={"status": detail}, headers={"Retry-After": "1"})
+    return {"status": "ready", "load_seconds": loader.load_seconds}
+
+# Application factory
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start loading heavy state in the background so the server accepts connections immediately"""
+    app.state.loader.start()
+    app.state.admission.ensure_monitor()
+    compaction = asyncio.create_task(compact_periodically(app.state.loader))
+    try:
+        yield
+    finally:
+        compaction.cancel()
+        app.state.loader.close()
+        if app.state.recorder is not None:
+            app.state.recorder.close()
+
+def create_app(news_bot: Optional[NewsBot] = None, bot_factory: Callable[[], NewsBot] = NewsBot,
+               rate_limiter: Optional[TokenBucketLimiter] = None,
+               admission: Optional[AdmissionController] = None,
+               static_dir: Optional[str] = None,
+               recorder: Optional[TrafficRecorder] = None) -> FastAPI:
+    """Build the FastAPI app; pass `news_bot` to skip background loading"""
+    app = FastAPI(title="AI News Chatbot", description="Personalized news chatbot with tech, politics, and finance updates",
+                  lifespan=lifespan)
+    app.state.loader = NewsBotLoader(bot_factory, news_bot)
+    app.state.rate_limiter = rate_limiter or default_rate_limiter()
+    app.state.admission = admission or default_admission()
+    app.state.recorder = recorder or default_recorder()
+    app.include_router(router)
+    # Capture sits inside compression so it records identity-encoded bodies
+    if app.state.recorder is not None:
+        app.add_middleware(TrafficCaptureMiddleware, recorder=app.state.recorder)
+    app.add_middleware(CompressionMiddleware, settings=COMPRESSION_SETTINGS)
+    # Serve only the dedicated assets directory, never the source tree beside it
+    app.mount("/static", StaticFiles(directory=static_dir or STATIC_DIR), name="static")
+    return app
+
+app = create_app()
+
 # Run the application
 if __name__ == "__main__":
     print("🚀 Starting AI News Chatbot...")
@@ -996,17 +2851,25 @@ if __name__ == "__main__":
     print("   • 30 mock articles across tech, politics, and finance")
     print("   • REST API endpoints")
     print("   • Elegant and responsive UI")
+    print("   • Hot/cold article retention (set NEWSBOT_RETENTION_DAYS)")
     print("\n🌐 Available endpoints:")
     print("   • GET  /          - Main chat interface")
     print("   • POST /chat      - Chat with the bot")
     print("   • GET  /news      - Get all news articles")
     print("   • GET  /news/{category} - Get news by category")
     print("   • GET  /news/article/{id} - Get specific article")
+    print("   • POST /news/bulk - Bulk NDJSON article ingestion")
+    print("   • GET  /news/trending - Most engaged-with articles")
+    print("   • POST /news/article/{id}/events - Record a view or click")
+    print("   • GET  /news/{category}/updates - Long-poll for new articles")
+    print("   • GET  /news/{category}/stream  - Server-sent events for new articles")
     print("   • GET  /health    - Health check")
+    print("   • GET  /ready     - Readiness check")
     print("\n💡 Try asking:")
     print("   • 'What's the latest tech news?'")
     print("   • 'Show me finance updates'")
     print("   • 'Any political news today?'")
     print("   • 'Hello' or 'Help'")
     
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""Replay captured traffic against the app in-process.
+
+Reads a JSONL log written by TrafficCaptureMiddleware (NEWSBOT_CAPTURE_PATH),
+sends every request to a fresh app at the recorded rate (or faster), and
+reports latency distributions per route plus responses that differ from the
+recorded ones. Recorded ETags are rebased onto the replay app's store epoch so
+conditional polls are re-evaluated rather than reported as differences.
+
+    python replay.py traffic.jsonl [--speed 10] [--concurrency 16] [--ignore-field response]
+"""
+import argparse
+import asyncio
+import difflib
+import hashlib
+import json
+import random
+import re
+import time
+from collections import defaultdict
+
+import httpx
+
+import main
+
+# Subscriptions never finish under an in-process transport; older logs may still contain them
+UNREPLAYABLE_ROUTES = {"/news/{category}/updates", "/news/{category}/stream"}
+# Collection ETags look like "<scope>-<store epoch>-<change counter>"
+ETAG_RE = re.compile(r'^(W/)?"(.+)-[0-9a-f]+-(\d+)"$')
+ROUTE_PATTERNS = [
+    (re.compile(r"^/news/article/[^/]+$"), "/news/article/{id}"),
+    (re.compile(r"^/news/[^/]+/updates$"), "/news/{category}/updates"),
+    (re.compile(r"^/news/[^/]+/stream$"), "/news/{category}/stream"),
+    (re.compile(r"^/news/[^/]+$"), "/news/{category}"),
+]
+
+
+def route_of(path: str) -> str:
+    for pattern, route in ROUTE_PATTERNS:
+        if pattern.match(path):
+            return route
+    return path
+
+
+def load_log(path: str, limit: int = 0) -> list:
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                records.append(json.loads(line))
+                if limit and len(records) >= limit:
+                    break
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+
+def replayable(record: dict) -> bool:
+    """False for subscriptions and for requests whose body was too large to record"""
+    return route_of(record["path"]) not in UNREPLAYABLE_ROUTES and "body" in record
+
+
+def rebase_etags(value: str) -> str:
+    """Point recorded ETags at this process's store epoch, so the change counter decides as it did when recorded"""
+    tags = []
+    for tag in value.split(","):
+        match = ETAG_RE.match(tag.strip())
+        tags.append(f'{match[1] or ""}"{match[2]}-{main.STORE_EPOCH}-{match[3]}"' if match else tag.strip())
+    return ", ".join(tags)
+
+
+def replay_headers(record: dict) -> dict:
+    headers = dict(record["headers"])
+    headers["accept-encoding"] = "identity"
+    if "if-none-match" in headers:
+        headers["if-none-match"] = rebase_etags(headers["if-none-match"])
+    # Last-Modified times of the recording process cannot be mapped onto this one
+    headers.pop("if-modified-since", None)
+    if record["body"]:
+        headers["content-type"] = "application/json"
+    return headers
+
+
+def expected_for(record: dict, last_ok: dict):
+    """The recorded exchange a replayed response should match, or None when it cannot be checked
+
+    A 304 answered from If-Modified-Since is replayed unconditionally, so it is compared
+    with the last 200 recorded for the same request instead.
+    """
+    key = (record["method"], record["path"], record["query"])
+    if record["status"] == 200:
+        last_ok[key] = record
+    if record["status"] != 304 or "if-none-match" in record["headers"]:
+        return record
+    return last_ok.get(key)
+
+
+def strip_fields(value, ignored: set):
+    """Drop ignored keys at any depth so they do not count as differences"""
+    if isinstance(value, dict):
+        return {key: strip_fields(item, ignored) for key, item in value.items() if key not in ignored}
+    if isinstance(value, list):
+        return [strip_fields(item, ignored) for item in value]
+    return value
+
+
+def compare(record: dict, status: int, body: bytes, ignored: set):
+    """Return None when the replayed response matches the recorded one, else a diff text"""
+    if status != record["status"]:
+        return f"status {record['status']} -> {status}"
+    if "response" not in record:
+        if hashlib.sha256(body).hexdigest() == record["response_sha256"]:
+            return None
+        return "body hash differs (recorded body not kept)"
+    try:
+        expected = strip_fields(json.loads(record["response"]), ignored)
+        actual = strip_fields(json.loads(body), ignored)
+    except ValueError:
+        expected, actual = record["response"], body.decode("utf-8", "replace")
+    if expected == actual:
+        return None
+    expected_lines = json.dumps(expected, indent=1, sort_keys=True).splitlines()
+    actual_lines = json.dumps(actual, indent=1, sort_keys=True).splitlines()
+    return "\n".join(difflib.unified_diff(expected_lines, actual_lines, "recorded", "replayed", lineterm="", n=1))
+
+
+async def replay(app, records: list, speed: float, concurrency: int, ignored: set) -> dict:
+    results = defaultdict(lambda: {"latency": [], "recorded": [], "diffs": [], "unchecked": 0})
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    first_ts = records[0]["ts"] if records else 0.0
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+        async def send(record, expected):
+            async with semaphore:
+                url = record["path"] + (f"?{record['query']}" if record["query"] else "")
+                headers = replay_headers(record)
+                start = time.perf_counter()
+                response = await client.request(record["method"], url, headers=headers,
+                                                content=record["body"].encode() or None)
+                elapsed = time.perf_counter() - start
+            route = results[f"{record['method']} {route_of(record['path'])}"]
+            route["latency"].append(elapsed * 1000)
+            route["recorded"].append(record["latency_ms"])
+            if expected is None:
+                route["unchecked"] += 1
+                return
+            diff = compare(expected, response.status_code, response.content, ignored)
+            if diff:
+                route["diffs"].append((url, diff))
+
+        started = time.perf_counter()
+        tasks = []
+        last_ok = {}
+        for record in records:
+            if speed > 0:
+                delay = (record["ts"] - first_ts) / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(record, expected_for(record, last_ok))))
+        await asyncio.gather(*tasks)
+    return results
+
+
+def pct(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def report(results: dict, show_diffs: int):
+    print(f"{'route':<32} {'n':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'rec p50':>8} {'diffs':>6} {'unchecked':>9}")
+    for route, data in sorted(results.items()):
+        latency = data["latency"]
+        print(f"{route:<32} {len(latency):>6} {pct(latency, .5):>8.2f} {pct(latency, .9):>8.2f}"
+              f" {pct(latency, .99):>8.2f} {max(latency):>8.2f} {pct(data['recorded'], .5):>8.2f}"
+              f" {len(data['diffs']):>6} {data['unchecked']:>9}")
+    shown = 0
+    for route, data in sorted(results.items()):
+        for url, diff in data["diffs"]:
+            if shown >= show_diffs:
+                return
+            print(f"\n--- {route} {url}\n{diff}")
+            shown += 1
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="JSONL traffic log")
+    parser.add_argument("--speed", type=float, default=1.0, help="rate multiplier; 0 replays as fast as possible")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--limit", type=int, default=0, help="replay only the first N records")
+    parser.add_argument("--ignore-field", action="append", default=[], help="JSON key to ignore when diffing")
+    parser.add_argument("--show-diffs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0, help="seed for the bot's random choices")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    loaded = load_log(args.log, args.limit)
+    records = [record for record in loaded if replayable(record)]
+    if len(records) < len(loaded):
+        print(f"skipping {len(loaded) - len(records)} subscription or body-truncated records")
+    # Replayed traffic comes from one client, so per-client limits and shedding are disabled
+    app = main.create_app(
+        news_bot=main.NewsBot(),
+        rate_limiter=main.TokenBucketLimiter(rate=1e12, burst=1e12, slots=1),
+        admission=main.AdmissionController(max_in_flight=len(records) + 1, max_lag=float("inf")),
+    )
+    started = time.perf_counter()
+    results = asyncio.run(replay(app, records, args.speed, args.concurrency, set(args.ignore_field)))
+    print(f"replayed {len(records)} requests in {time.perf_counter() - started:.2f}s\n")
+    report(results, args.show_diffs)
+
+
+if __name__ == "__main__":
+    main_cli()